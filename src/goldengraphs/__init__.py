@@ -1 +1,8 @@
-from goldengraphs.algorithms import a_star, dijkstra, dijkstra_all_paths
+from goldengraphs.algorithms import (
+    a_star,
+    a_star_bidir,
+    bidirectional_dijkstra,
+    dijkstra,
+    dijkstra_all_paths,
+    dijkstra_multi_source,
+)
@@ -1,12 +1,30 @@
-from .shortest_path import a_star, dijkstra, dijkstra_all_paths
+from .graph import CSRGraph, DirectedGraph, Graph
+from .minimum_spanning_tree import kruskal
+from .shortest_path import (
+    a_star,
+    a_star_bidir,
+    bidirectional_dijkstra,
+    dijkstra,
+    dijkstra_all_paths,
+    dijkstra_multi_source,
+)
 from .topological import kahn
-from .union_find import UnionFind
+from .union_find import UnionFind, UnionFindArray
 from .utils import reconstruct_path
 
 __all__ = [
+    "CSRGraph",
+    "DirectedGraph",
+    "Graph",
+    "UnionFind",
+    "UnionFindArray",
     "a_star",
+    "a_star_bidir",
+    "bidirectional_dijkstra",
     "dijkstra",
     "dijkstra_all_paths",
+    "dijkstra_multi_source",
     "kahn",
+    "kruskal",
     "reconstruct_path",
 ]
@@ -1,9 +1,31 @@
+from array import array
 from collections.abc import ItemsView, Iterator, KeysView
-from typing import Generic, Optional, TypeVar
+from itertools import accumulate
+from typing import Generic, NamedTuple, Optional, TypeVar
 
 Node = TypeVar("Node")
 
 
+class CSRGraph(NamedTuple, Generic[Node]):
+    """
+    Compressed Sparse Row view of a DirectedGraph.
+
+    Nodes are interned to integer ids (``ids`` maps node -> id, in insertion order).
+    The out-edges of node id ``u`` are ``indices[indptr[u]:indptr[u + 1]]`` with
+    matching ``weights``, stored as contiguous typed arrays.
+    """
+
+    ids: dict[Node, int]
+    indptr: array[int]
+    indices: array[int]
+    weights: array[float]
+
+    def get_adjs(self, node: int) -> Iterator[tuple[int, float]]:
+        """Yield (neighbor id, weight) tuples for the node with id ``node``."""
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        return zip(self.indices[lo:hi], self.weights[lo:hi], strict=True)
+
+
 class DirectedGraph(Generic[Node]):
     def __init__(
         self,
@@ -11,37 +33,50 @@ class DirectedGraph(Generic[Node]):
         edges: Optional[set[tuple[Node, Node, float]]] = None,
     ) -> None:
         self.adjs: dict[Node, dict[Node, float]] = {}
+        # Reverse adjacency: radjs[dst] is the set of sources with an edge into dst
+        self.radjs: dict[Node, set[Node]] = {}
+        self._csr: CSRGraph[Node] | None = None
         if nodes:
             for node in nodes:
                 self.adjs[node] = {}
+                self.radjs[node] = set()
         if edges:
             for src, dst, weight in edges:
                 self.add_edge(src, dst, weight)
 
     def add_edge(self, src: Node, dst: Node, weight: float) -> None:
+        self._csr = None
         for node in src, dst:
             if node not in self.adjs:
                 self.adjs[node] = {}
+                self.radjs[node] = set()
         self.adjs[src][dst] = weight
+        self.radjs[dst].add(src)
 
     def remove_edge(self, src: Node, dst: Node) -> bool:
         if src not in self.adjs or dst not in self.adjs[src]:
             return False
+        self._csr = None
         self.adjs[src].pop(dst)
+        self.radjs[dst].discard(src)
         return True
 
     def add_node(self, node: Node) -> bool:
         if node in self.adjs:
             return False
+        self._csr = None
         self.adjs[node] = {}
+        self.radjs[node] = set()
         return True
 
     def remove_node(self, node: Node) -> bool:
         if node not in self.adjs:
             return False
-        for other in self.adjs:
-            self.adjs[other].pop(node, None)
-        self.adjs.pop(node)
+        self._csr = None
+        for src in self.radjs.pop(node):
+            self.adjs[src].pop(node)
+        for dst in self.adjs.pop(node):
+            self.radjs[dst].discard(node)
         return True
 
     def get_nodes(self) -> KeysView[Node]:
@@ -50,6 +85,10 @@ class DirectedGraph(Generic[Node]):
     def get_adjs(self, node: Node) -> ItemsView[Node, float]:
         return self.adjs[node].items()
 
+    def get_radjs(self, node: Node) -> Iterator[tuple[Node, float]]:
+        for src in self.radjs[node]:
+            yield src, self.adjs[src][node]
+
     def get_edges(self) -> Iterator[tuple[Node, Node, float]]:
         for src in self.adjs:
             for dst, weight in self.adjs[src].items():
@@ -70,11 +109,7 @@ class DirectedGraph(Generic[Node]):
         return None
 
     def in_degree(self, node: Node) -> int:
-        total = 0
-        for src in self.adjs:
-            if node in self.adjs[src]:
-                total += 1
-        return total
+        return len(self.radjs.get(node, ()))
 
     def out_degree(self, node: Node) -> int:
         return len(self.adjs.get(node, {}))
@@ -82,16 +117,47 @@ class DirectedGraph(Generic[Node]):
     def num_edges(self) -> int:
         return sum(len(self.adjs[src]) for src in self.adjs)
 
+    def to_csr(self) -> CSRGraph[Node]:
+        """
+        Return a CSR snapshot of the graph.
+
+        Built lazily on first call and cached until the graph is next mutated.
+        """
+        if self._csr is None:
+            ids = {node: i for i, node in enumerate(self.adjs)}
+            indptr = array("q", accumulate((len(dsts) for dsts in self.adjs.values()), initial=0))
+            indices = array("q", [ids[dst] for dsts in self.adjs.values() for dst in dsts])
+            weights = array("d", [weight for dsts in self.adjs.values() for weight in dsts.values()])
+            self._csr = CSRGraph(ids, indptr, indices, weights)
+        return self._csr
+
 
 class Graph(DirectedGraph[Node]):
     def add_edge(self, src: Node, dst: Node, weight: float) -> None:
-        super().add_edge(src, dst, weight)
-        super().add_edge(dst, src, weight)
+        self._csr = None
+        adjs, radjs = self.adjs, self.radjs
+        if src not in adjs:
+            adjs[src] = {}
+            radjs[src] = set()
+        if dst not in adjs:
+            adjs[dst] = {}
+            radjs[dst] = set()
+        adjs[src][dst] = weight
+        adjs[dst][src] = weight
+        radjs[dst].add(src)
+        radjs[src].add(dst)
 
     def remove_edge(self, src: Node, dst: Node) -> bool:
-        a = super().remove_edge(src, dst)
-        b = super().remove_edge(dst, src)
-        return a or b
+        # Edges are always stored in both directions, so checking one is enough (pop(src, None) covers self-loops)
+        adjs, radjs = self.adjs, self.radjs
+        if src not in adjs or dst not in adjs[src]:
+            return False
+        self._csr = None
+        adjs[src].pop(dst)
+        adjs[dst].pop(src, None)
+        radjs[dst].discard(src)
+        radjs[src].discard(dst)
+        return True
 
     def degree(self, node: Node) -> int:
         return self.out_degree(node)
@@ -1,7 +1,9 @@
+from array import array
+from itertools import chain, repeat
 from typing import TypeVar
 
 from .graph import DirectedGraph
-from .union_find import UnionFind
+from .union_find import UnionFindArray, uf_union
 
 Node = TypeVar("Node")
 
@@ -9,9 +11,16 @@ Node = TypeVar("Node")
 def kruskal(
     graph: DirectedGraph[Node],
 ) -> DirectedGraph[Node]:
-    uf: UnionFind[Node] = UnionFind()
+    ids, indptr, indices, weights = graph.to_csr()
+    nodes = list(ids)
+    # CSR already stores edge destinations and weights as flat arrays; expand indptr to get the sources
+    srcs = array("q", chain.from_iterable(repeat(u, indptr[u + 1] - indptr[u]) for u in range(len(nodes))))
+    uf = UnionFindArray(len(nodes))
+    parent, size = uf.parent, uf.size
     mst: DirectedGraph[Node] = DirectedGraph()
-    for src, dst, weight in sorted(graph.get_edges(), key=lambda e: e[2]):
-        if uf.union(src, dst):
-            mst.add_edge(src, dst, weight)
+    # Stable sort of edge indices by weight, keyed in C instead of through a lambda
+    for i in sorted(range(len(weights)), key=weights.__getitem__):
+        src, dst = srcs[i], indices[i]
+        if uf_union(parent, size, src, dst):
+            mst.add_edge(nodes[src], nodes[dst], weights[i])
     return mst
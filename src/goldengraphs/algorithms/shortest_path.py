@@ -1,6 +1,11 @@
-from heapq import heappop, heappush
-from typing import Callable, Iterable, TypeVar
-
+from array import array
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from heapq import heapify, heappop, heappush
+from typing import Any, Callable, Iterable, TypeVar, cast, overload
+
+from .graph import CSRGraph
 from .utils import reconstruct_path
 
 Node = TypeVar("Node")
@@ -10,22 +15,71 @@ Node = TypeVar("Node")
 # - visited: set of already-visited nodes
 # - dists: current known distances
 # - parent: parent pointers for path reconstruction
-# - queue: current priority queue contents (as list of (priority, node) tuples)
-StepCallback = Callable[[Node, set[Node], dict[Node, float], dict[Node, Node], list[tuple[float, Node]]], None]
+# - queue: live view of the priority queue contents (as a sequence of (priority, node) tuples)
+StepCallback = Callable[[Node, set[Node], dict[Node, float], dict[Node, Node], Sequence[tuple[float, Node]]], None]
+
+
+class _QueueView(Sequence[tuple[float, Node]]):
+    """Read-only view of a heap of (priority, counter, node) entries as (priority, node) pairs.
+
+    Wraps the heap list itself, so it tracks pushes and pops without copying.
+    """
+
+    __slots__ = ("_q",)
+
+    def __init__(self, q: list[tuple[float, int, Node]]) -> None:
+        self._q = q
+
+    @overload
+    def __getitem__(self, i: int) -> tuple[float, Node]: ...
 
+    @overload
+    def __getitem__(self, i: slice) -> list[tuple[float, Node]]: ...
 
+    def __getitem__(self, i: int | slice) -> tuple[float, Node] | list[tuple[float, Node]]:
+        if isinstance(i, slice):
+            return [(priority, node) for priority, _, node in self._q[i]]
+        priority, _, node = self._q[i]
+        return priority, node
+
+    def __len__(self) -> int:
+        return len(self._q)
+
+    def __iter__(self) -> Iterator[tuple[float, Node]]:
+        return ((priority, node) for priority, _, node in self._q)
+
+
+@overload
+def dijkstra(
+    source: int,
+    is_goal: Callable[[int, float], bool],
+    adjs: CSRGraph[Any],
+    on_step: StepCallback[int] | None = None,
+) -> tuple[list[int], float]: ...
+
+
+@overload
 def dijkstra(
     source: Node,
     is_goal: Callable[[Node, float], bool],
     adjs: Callable[[Node], Iterable[tuple[Node, float]]],
     on_step: StepCallback[Node] | None = None,
-) -> tuple[list[Node], float]:
+) -> tuple[list[Node], float]: ...
+
+
+def dijkstra(
+    source: Any,
+    is_goal: Callable[[Any, float], bool],
+    adjs: Callable[[Any], Iterable[tuple[Any, float]]] | CSRGraph[Any],
+    on_step: StepCallback[Any] | None = None,
+) -> tuple[list[Any], float]:
     """Run Dijkstra's shortest path algorithm.
 
     Args:
         source: Starting node
         is_goal: Function that returns True if a node is the goal (takes node and distance)
-        adjs: Function that yields (neighbor, distance) tuples for a given node
+        adjs: Function that yields (neighbor, distance) tuples for a given node, or a CSRGraph
+        (from DirectedGraph.to_csr), in which case nodes are the graph's integer node ids
         on_step: Optional callback called at each step with algorithm state. on_step functions should
         not mutate its arguments.
 
@@ -33,47 +87,109 @@ def dijkstra(
         Tuple of (path from source to goal, distance from source to goal)
 
     """
+    if isinstance(adjs, CSRGraph):
+        csr = cast("CSRGraph[Any]", adjs)
+        if on_step is None:
+            return _search_csr(csr, source, is_goal)
+        adjs = csr.get_adjs
+    return _dijkstra(source, is_goal, adjs, on_step)
+
+
+def _dijkstra(
+    source: Node,
+    is_goal: Callable[[Node, float], bool],
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    on_step: StepCallback[Node] | None,
+) -> tuple[list[Node], float]:
     start = source
     dists: dict[Node, float] = {start: 0}
     parent: dict[Node, Node] = {}
     visited: set[Node] = set()
     counter: int = 0
     q: list[tuple[float, int, Node]] = [(0, counter, start)]
+    dists_get = dists.get
+    inf = float("inf")
+    queue_view = _QueueView(q)
     while q:
-        _, _, curr = heappop(q)
+        d, _, curr = heappop(q)
 
-        if curr in visited:
+        # Entries are only pushed on strict improvement, so an entry is stale iff a shorter distance
+        # has since been recorded. Skipping those means each node is expanded exactly once.
+        du = dists[curr]
+        if d > du:
             continue
-        visited.add(curr)
 
         if on_step:
-            queue_view = [(priority, node) for priority, _, node in q]
+            visited.add(curr)
             on_step(curr, visited, dists, parent, queue_view)
 
-        if is_goal(curr, dists[curr]):
-            return (reconstruct_path(source, curr, parent), dists[curr])
+        if is_goal(curr, du):
+            return (reconstruct_path(source, curr, parent), du)
 
         for adj, adj_dist in adjs(curr):
-            dist = dists[curr] + adj_dist
-            if dist < dists.get(adj, float("inf")):
+            dist = du + adj_dist
+            if dist < dists_get(adj, inf):
                 dists[adj] = dist
                 counter += 1
-                heappush(q, (dists[adj], counter, adj))
+                heappush(q, (dist, counter, adj))
                 parent[adj] = curr
+                if len(q) > 2 * len(dists):
+                    _compact(q, dists)
+
+    return [], inf
+
 
-    return [], float("inf")
+def bidirectional_dijkstra(
+    source: Node,
+    target: Node,
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    radjs: Callable[[Node], Iterable[tuple[Node, float]]],
+) -> tuple[list[Node], float]:
+    """Run Dijkstra's algorithm from source and target simultaneously.
+
+    Settles roughly half as many nodes as dijkstra for point-to-point queries.
+
+    Args:
+        source: Starting node
+        target: Goal node
+        adjs: Function that yields (neighbor, distance) tuples for a given node
+        radjs: Function that yields (predecessor, distance) tuples for a given node, i.e. adjs on the
+        reversed graph. For undirected graphs this is adjs itself.
+
+    Returns:
+        Tuple of (path from source to target, distance from source to target)
+
+    """
+    return _bidirectional_search(source, target, adjs, radjs, None)
 
 
+@overload
+def dijkstra_all_paths(
+    source: int,
+    adjs: CSRGraph[Any],
+    on_step: StepCallback[int] | None = None,
+) -> tuple[dict[int, float], dict[int, int]]: ...
+
+
+@overload
 def dijkstra_all_paths(
     source: Node,
     adjs: Callable[[Node], Iterable[tuple[Node, float]]],
     on_step: StepCallback[Node] | None = None,
-) -> tuple[dict[Node, float], dict[Node, Node]]:
+) -> tuple[dict[Node, float], dict[Node, Node]]: ...
+
+
+def dijkstra_all_paths(
+    source: Any,
+    adjs: Callable[[Any], Iterable[tuple[Any, float]]] | CSRGraph[Any],
+    on_step: StepCallback[Any] | None = None,
+) -> tuple[dict[Any, float], dict[Any, Any]]:
     """Find shortest paths from source to all reachable nodes.
 
     Args:
         source: Starting node
-        adjs: Function that yields (neighbor, distance) tuples for a given node
+        adjs: Function that yields (neighbor, distance) tuples for a given node, or a CSRGraph
+        (from DirectedGraph.to_csr), in which case nodes are the graph's integer node ids
         on_step: Optional callback called at each step with algorithm state. on_step functions should
         not mutate its arguments.
 
@@ -83,86 +199,370 @@ def dijkstra_all_paths(
         - parent: Maps each reachable node to its predecessor in the shortest path tree
 
     """
+    if isinstance(adjs, CSRGraph):
+        csr = cast("CSRGraph[Any]", adjs)
+        if on_step is None:
+            dists_out, parent_out = _csr_buffers(len(csr.ids))
+            _dijkstra_csr(csr.indptr, csr.indices, csr.weights, source, dists_out, parent_out)
+            return (
+                {node: dist for node, dist in enumerate(dists_out) if dist != float("inf")},
+                {node: prev for node, prev in enumerate(parent_out) if prev != -1},
+            )
+        adjs = csr.get_adjs
+    return _dijkstra_all_paths(source, adjs, on_step)
+
+
+def _dijkstra_all_paths(
+    source: Node,
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    on_step: StepCallback[Node] | None,
+) -> tuple[dict[Node, float], dict[Node, Node]]:
     start = source
     dists: dict[Node, float] = {start: 0}
     parent: dict[Node, Node] = {}
     visited: set[Node] = set()
     counter: int = 0
     q: list[tuple[float, int, Node]] = [(0, counter, start)]
+    dists_get = dists.get
+    inf = float("inf")
+    queue_view = _QueueView(q)
     while q:
-        _, _, curr = heappop(q)
+        d, _, curr = heappop(q)
 
-        if curr in visited:
+        # Entries are only pushed on strict improvement, so an entry is stale iff a shorter distance
+        # has since been recorded. Skipping those means each node is expanded exactly once.
+        du = dists[curr]
+        if d > du:
             continue
-        visited.add(curr)
 
         if on_step:
-            queue_view = [(priority, node) for priority, _, node in q]
+            visited.add(curr)
             on_step(curr, visited, dists, parent, queue_view)
 
         for adj, adj_dist in adjs(curr):
-            dist = dists[curr] + adj_dist
-            if dist < dists.get(adj, float("inf")):
+            dist = du + adj_dist
+            if dist < dists_get(adj, inf):
                 dists[adj] = dist
                 counter += 1
-                heappush(q, (dists[adj], counter, adj))
+                heappush(q, (dist, counter, adj))
                 parent[adj] = curr
+                if len(q) > 2 * len(dists):
+                    _compact(q, dists)
 
     return dists, parent
 
 
+def dijkstra_multi_source(
+    sources: Iterable[int],
+    indptr: array[int],
+    indices: array[int],
+    weights: array[float],
+    max_workers: int = 1,
+) -> tuple[list[array[float]], list[array[int]]]:
+    """Run single-source Dijkstra from each of several sources over the same CSR arrays.
+
+    Args:
+        sources: Source node ids
+        indptr: CSR row pointers (see DirectedGraph.to_csr)
+        indices: CSR neighbor ids
+        weights: CSR edge weights
+        max_workers: Number of threads to spread the sources across. Each search keeps its own heap and
+        output arrays, so they run independently; this only speeds things up on free-threaded builds.
+
+    Returns:
+        Tuple of (dists, parent) where dists[i] and parent[i] are arrays indexed by node id for the
+        i-th source, holding inf / -1 for unreachable nodes.
+
+    """
+    n = len(indptr) - 1
+
+    def run(source: int) -> tuple[array[float], array[int]]:
+        dists_out, parent_out = _csr_buffers(n)
+        _dijkstra_csr(indptr, indices, weights, source, dists_out, parent_out)
+        return dists_out, parent_out
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers) as executor:
+            results = list(executor.map(run, sources))
+    else:
+        results = [run(source) for source in sources]
+    return [dists for dists, _ in results], [parent for _, parent in results]
+
+
+def _compact(q: list[tuple[float, int, Node]], dists: dict[Node, float]) -> None:
+    """Drop stale entries from a lazy-deletion heap in place.
+
+    An entry is live iff its priority still equals the node's recorded distance, so at most one entry per
+    node survives. Called once the heap outgrows 2 * len(dists), which keeps it O(V) on inputs that relax
+    the same nodes over and over (e.g. star graphs) at amortized O(1) cost per push.
+    """
+    q[:] = [entry for entry in q if entry[0] == dists[entry[2]]]
+    heapify(q)
+
+
+def _csr_buffers(n: int) -> tuple[array[float], array[int]]:
+    """Allocate the dists (all inf) and parent (all -1) arrays used by _dijkstra_csr."""
+    return array("d", [float("inf")]) * n, array("q", [-1]) * n
+
+
+def _dijkstra_csr(
+    indptr: array[int],
+    indices: array[int],
+    weights: array[float],
+    source: int,
+    dists_out: array[float],
+    parent_out: array[int],
+    is_goal: Callable[[int, float], bool] | None = None,
+    h: Callable[[int], float] | None = None,
+) -> int:
+    """Single-source Dijkstra (or A* when h is given) over CSR arrays.
+
+    dists_out must be filled with inf and parent_out with -1 (one slot per node id). On return they hold
+    the shortest distance and predecessor id of every settled node. Returns the id of the first settled
+    node satisfying is_goal, or -1 if the search exhausted the graph.
+
+    Uses a lazy-deletion heap rather than decrease-key: in CPython heapq's C sift beats an indexed heap
+    written in Python, even though stale entries let the heap grow past V. Like the callable a_star, a node
+    whose distance improves after it was expanded is reopened, so an admissible but inconsistent h still
+    yields a shortest path.
+    """
+    # Last key pushed per node. Without h the key is the distance, so dists_out doubles as the key array
+    keys = array("d", [float("inf")]) * len(dists_out) if h else dists_out
+    dists_out[source] = 0.0
+    keys[source] = h(source) if h else 0.0
+    q: list[tuple[float, int]] = [(keys[source], source)]
+    while q:
+        d, u = heappop(q)
+
+        # Entries are only pushed on strict improvement, so an entry above the node's last pushed key is stale
+        if d > keys[u]:
+            continue
+
+        du = dists_out[u]
+        if is_goal is not None and is_goal(u, du):
+            return u
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = du + weights[k]
+            if nd < dists_out[v]:
+                dists_out[v] = nd
+                parent_out[v] = u
+                key = nd + h(v) if h else nd
+                keys[v] = key
+                heappush(q, (key, v))
+
+    return -1
+
+
+def _search_csr(
+    csr: CSRGraph[Any],
+    source: int,
+    is_goal: Callable[[int, float], bool],
+    h: Callable[[int], float] | None = None,
+) -> tuple[list[int], float]:
+    dists_out, parent_out = _csr_buffers(len(csr.ids))
+    goal = _dijkstra_csr(csr.indptr, csr.indices, csr.weights, source, dists_out, parent_out, is_goal, h)
+    if goal == -1:
+        return [], float("inf")
+    return reconstruct_path(source, goal, parent_out), dists_out[goal]
+
+
+def _bidirectional_search(
+    source: Node,
+    target: Node,
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    radjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    potential: Callable[[Node], float] | None,
+) -> tuple[list[Node], float]:
+    """Bidirectional Dijkstra, optionally on edge costs reduced by a potential function.
+
+    Forward keys are dist + potential(node) and backward keys are dist - potential(node). With a consistent
+    potential both searches see non-negative reduced costs and the constant offsets cancel, so the usual
+    stopping rule (top forward key + top backward key >= best meeting distance) still holds.
+    """
+    if source == target:
+        return [source], 0
+    dists_f: dict[Node, float] = {source: 0}
+    dists_b: dict[Node, float] = {target: 0}
+    parent_f: dict[Node, Node] = {}
+    parent_b: dict[Node, Node] = {}
+    visited_f: set[Node] = set()
+    visited_b: set[Node] = set()
+    counter: int = 0
+    p_source, p_target = (0, 0) if potential is None else (potential(source), potential(target))
+    q_f: list[tuple[float, int, Node]] = [(p_source, counter, source)]
+    q_b: list[tuple[float, int, Node]] = [(-p_target, counter, target)]
+    inf = float("inf")
+    best = inf
+    meet: Node | None = None
+    while q_f and q_b:
+        if q_f[0][0] + q_b[0][0] >= best:
+            break
+
+        # Expand whichever frontier is closer to its origin
+        if q_f[0][0] <= q_b[0][0]:
+            q, dists, other, parent, visited, nbrs, sign = q_f, dists_f, dists_b, parent_f, visited_f, adjs, 1
+        else:
+            q, dists, other, parent, visited, nbrs, sign = q_b, dists_b, dists_f, parent_b, visited_b, radjs, -1
+        _, _, curr = heappop(q)
+
+        if curr in visited:
+            continue
+        visited.add(curr)
+
+        du = dists[curr]
+        for adj, adj_dist in nbrs(curr):
+            dist = du + adj_dist
+            if dist < dists.get(adj, inf):
+                dists[adj] = dist
+                counter += 1
+                heappush(q, (dist if potential is None else dist + sign * potential(adj), counter, adj))
+                parent[adj] = curr
+                if adj in other and dist + other[adj] < best:
+                    best = dist + other[adj]
+                    meet = adj
+
+    if meet is None:
+        return [], inf
+    # reconstruct_path on the backward tree yields target -> meet, so reverse it and drop meet
+    return reconstruct_path(source, meet, parent_f) + reconstruct_path(target, meet, parent_b)[-2::-1], best
+
+
 # TODO: multi_dijkstra that takes in a list of nodes (waypoints)
 # and finds shortest path from a to b that goes through each waypoint
 
 
+@overload
+def a_star(
+    source: int,
+    is_goal: Callable[[int, float], bool],
+    adjs: CSRGraph[Any],
+    h: Callable[[int], float],
+    on_step: StepCallback[int] | None = None,
+    cache_h: bool = False,
+) -> tuple[list[int], float]: ...
+
+
+@overload
 def a_star(
     source: Node,
     is_goal: Callable[[Node, float], bool],
     adjs: Callable[[Node], Iterable[tuple[Node, float]]],
     h: Callable[[Node], float],
     on_step: StepCallback[Node] | None = None,
-) -> tuple[list[Node], float]:
+    cache_h: bool = False,
+) -> tuple[list[Node], float]: ...
+
+
+def a_star(
+    source: Any,
+    is_goal: Callable[[Any, float], bool],
+    adjs: Callable[[Any], Iterable[tuple[Any, float]]] | CSRGraph[Any],
+    h: Callable[[Any], float],
+    on_step: StepCallback[Any] | None = None,
+    cache_h: bool = False,
+) -> tuple[list[Any], float]:
     """Run the A* pathfinding algorithm.
 
     Args:
         source: Starting node
         is_goal: Function that returns True if a node is the goal (takes node and distance)
-        adjs: Function that yields (neighbor, distance) tuples for a given node
+        adjs: Function that yields (neighbor, distance) tuples for a given node, or a CSRGraph
+        (from DirectedGraph.to_csr), in which case nodes are the graph's integer node ids
         h: Heuristic function estimating distance from a node to the goal.
-        Must never overestimate the actual distance.
+        Must never overestimate the actual distance. It need not be consistent: a node whose distance
+        improves after it was expanded is reopened.
         on_step: Optional callback called at each step with algorithm state. on_step functions should
         not mutate its arguments.
+        cache_h: Memoize h so it is evaluated at most once per node. Only use this when h is
+        deterministic and expensive to compute.
 
     Returns:
         Tuple of (path from source to goal, distance from source to goal)
 
     """
+    if cache_h:
+        h = cache(h)
+    if isinstance(adjs, CSRGraph):
+        csr = cast("CSRGraph[Any]", adjs)
+        if on_step is None:
+            return _search_csr(csr, source, is_goal, h)
+        adjs = csr.get_adjs
+    return _a_star(source, is_goal, adjs, h, on_step)
+
+
+def _a_star(
+    source: Node,
+    is_goal: Callable[[Node, float], bool],
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    h: Callable[[Node], float],
+    on_step: StepCallback[Node] | None,
+) -> tuple[list[Node], float]:
     start = source
     dists: dict[Node, float] = {start: 0}
     parent: dict[Node, Node] = {}
     visited: set[Node] = set()
+    # Last key pushed per node; entries are only pushed on strict improvement, so larger keys are stale
+    keys: dict[Node, float] = {start: h(start)}
     counter: int = 0
-    q: list[tuple[float, int, Node]] = [(h(start), counter, start)]
+    q: list[tuple[float, int, Node]] = [(keys[start], counter, start)]
+    dists_get = dists.get
+    inf = float("inf")
+    queue_view = _QueueView(q)
     while q:
-        _, _, curr = heappop(q)
+        d, _, curr = heappop(q)
 
-        if curr in visited:
+        if d > keys[curr]:
             continue
-        visited.add(curr)
 
         if on_step:
-            queue_view = [(priority, node) for priority, _, node in q]
+            visited.add(curr)
             on_step(curr, visited, dists, parent, queue_view)
 
-        if is_goal(curr, dists[curr]):
-            return (reconstruct_path(source, curr, parent), dists[curr])
+        du = dists[curr]
+        if is_goal(curr, du):
+            return (reconstruct_path(source, curr, parent), du)
 
         for adj, adj_dist in adjs(curr):
-            dist = dists[curr] + adj_dist
-            if dist < dists.get(adj, float("inf")):
+            dist = du + adj_dist
+            if dist < dists_get(adj, inf):
                 dists[adj] = dist
+                key = dist + h(adj)
+                keys[adj] = key
                 counter += 1
-                heappush(q, (dists[adj] + h(adj), counter, adj))
+                heappush(q, (key, counter, adj))
                 parent[adj] = curr
 
-    return ([], float("inf"))
+    return ([], inf)
+
+
+def a_star_bidir(
+    source: Node,
+    target: Node,
+    adjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    radjs: Callable[[Node], Iterable[tuple[Node, float]]],
+    h_f: Callable[[Node], float],
+    h_b: Callable[[Node], float] | None = None,
+) -> tuple[list[Node], float]:
+    """Run bidirectional A* between source and target.
+
+    Uses the average potential (h_f - h_b) / 2 forward and its negation backward, so both searches stay
+    admissible. Falls back to a_star when h_b is not given.
+
+    Args:
+        source: Starting node
+        target: Goal node
+        adjs: Function that yields (neighbor, distance) tuples for a given node
+        radjs: Function that yields (predecessor, distance) tuples for a given node, i.e. adjs on the
+        reversed graph. For undirected graphs this is adjs itself.
+        h_f: Heuristic estimating the distance from a node to target. Must be consistent.
+        h_b: Heuristic estimating the distance from source to a node. Must be consistent.
+
+    Returns:
+        Tuple of (path from source to target, distance from source to target)
+
+    """
+    if h_b is None:
+        return a_star(source, lambda node, _: node == target, adjs, h_f)
+    return _bidirectional_search(source, target, adjs, radjs, lambda node: (h_f(node) - h_b(node)) / 2)
@@ -1,27 +1,61 @@
-from collections import defaultdict, deque
-from typing import Callable, Iterable, TypeVar
+from array import array
+from collections import deque
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from types import MappingProxyType
+from typing import Callable, Iterable, TypeVar, overload
+
+from .graph import DirectedGraph
 
 Node = TypeVar("Node")
 
-# Step callback receives algorithm state at each iteration:
+# Step callback receives algorithm state at each iteration, as read-only live views (copy them to keep a snapshot):
 # - current: the node being processed
 # - order: nodes processed so far (in order)
 # - in_degree: current in-degree for each node
 # - queue: current queue contents
-StepCallback = Callable[[Node, list[Node], dict[Node, int], list[Node]], None]
+StepCallback = Callable[[Node, Sequence[Node], Mapping[Node, int], Sequence[Node]], None]
+
+
+class _SequenceView(Sequence[Node]):
+    """Read-only live view of a list or deque."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Sequence[Node]) -> None:
+        self._items = items
+
+    @overload
+    def __getitem__(self, i: int) -> Node: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[Node]: ...
+
+    def __getitem__(self, i: int | slice) -> Node | list[Node]:
+        if isinstance(i, slice):
+            # deque does not support slicing
+            return list(self._items)[i]
+        return self._items[i]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self._items)
 
 
 def kahn(
-    nodes: set[Node],
-    adjs: Callable[[Node], Iterable[Node]],
+    nodes: Collection[Node] | DirectedGraph[Node],
+    adjs: Callable[[Node], Iterable[Node]] | None = None,
     on_step: StepCallback[Node] | None = None,
 ) -> list[Node]:
     """Run Kahn's algorithm for topological sorting.
 
     Args:
-        nodes: Set of all nodes in the directed graph
+        nodes: Collection of all nodes in the directed graph, or a DirectedGraph (in which case adjs is not
+        needed). Nodes with equal rank are ordered as nodes iterates them.
         adjs: Function that yields adjacent nodes (outgoing edges) for a given node
-        on_step: Optional callback called at each step with algorithm state
+        on_step: Optional callback called at each step with algorithm state. on_step functions should
+        not mutate its arguments.
 
     Returns:
         Topologically sorted list of nodes. If the graph contains a cycle,
@@ -29,21 +63,68 @@ def kahn(
         will be waiting on each other.
 
     """
-    in_degree: dict[Node, int] = defaultdict(int)
+    if isinstance(nodes, DirectedGraph):
+        if on_step is None:
+            ids, indptr, indices, _ = nodes.to_csr()
+            order_out = array("q", [0]) * len(ids)
+            k = _kahn(indptr, indices, _in_degrees(indices, len(ids)), order_out)
+            id_to_node = list(ids)
+            return [id_to_node[u] for u in order_out[:k]]
+        adjs = nodes.adjs.__getitem__
+        # Same insertion order as the CSR ids, so tracing does not change the result
+        nodes = nodes.get_nodes()
+    if adjs is None:
+        msg = "adjs is required unless nodes is a DirectedGraph"
+        raise TypeError(msg)
+    # A plain dict, not a defaultdict: reading a missing key through the read-only view must not insert it
+    in_degree = dict.fromkeys(nodes, 0)
     for node in nodes:
         for adj in adjs(node):
-            in_degree[adj] += 1
+            in_degree[adj] = in_degree.get(adj, 0) + 1
     order: list[Node] = []
     q: deque[Node] = deque(node for node in nodes if in_degree[node] == 0)
+    order_view, in_degree_view, queue_view = _SequenceView(order), MappingProxyType(in_degree), _SequenceView(q)
     while q:
         node = q.popleft()
         order.append(node)
 
         if on_step:
-            on_step(node, order.copy(), dict(in_degree), list(q))
+            on_step(node, order_view, in_degree_view, queue_view)
 
         for adj in adjs(node):
             in_degree[adj] -= 1
             if in_degree[adj] == 0:
                 q.append(adj)
     return order
+
+
+def _in_degrees(indices: array[int], n: int) -> array[int]:
+    in_deg = array("q", [0]) * n
+    for v in indices:
+        in_deg[v] += 1
+    return in_deg
+
+
+def _kahn(indptr: array[int], indices: array[int], in_deg: array[int], order_out: array[int]) -> int:
+    """Kahn's algorithm over CSR arrays.
+
+    Writes the topological order into order_out and returns how many nodes were ordered (fewer than
+    len(order_out) if there is a cycle). in_deg is consumed. order_out doubles as the FIFO queue: nodes are
+    appended at tail when their in-degree hits zero and popped from head, so no separate queue is needed.
+    """
+    tail = 0
+    for u in range(len(in_deg)):
+        if in_deg[u] == 0:
+            order_out[tail] = u
+            tail += 1
+    head = 0
+    while head < tail:
+        u = order_out[head]
+        head += 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            in_deg[v] -= 1
+            if in_deg[v] == 0:
+                order_out[tail] = v
+                tail += 1
+    return tail
@@ -1,3 +1,4 @@
+from array import array
 from typing import Generic, TypeVar
 
 T = TypeVar("T")
@@ -9,13 +10,13 @@ class UnionFind(Generic[T]):
 
     Tracks elements partitioned into non-overlapping sets.
     Supports near O(1) amortized union and find operations
-    using path compression.
+    using path compression and union by size.
     """
 
     def __init__(self) -> None:
         """Initialize an empty UnionFind structure."""
         self.parent: dict[T, T] = {}
-        self.rank: dict[T, int] = {}
+        self.size: dict[T, int] = {}
 
     def find(self, x: T) -> T:
         """
@@ -23,13 +24,18 @@ class UnionFind(Generic[T]):
 
         Creates a new set if x hasn't been seen.
         """
-        if x not in self.parent:
-            self.parent[x] = x
-            self.rank[x] = 0
-        if self.parent[x] != x:
-            # Path compression
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+            return x
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point every node on the path directly at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
 
     def union(self, x: T, y: T) -> bool:
         """
@@ -42,12 +48,59 @@ class UnionFind(Generic[T]):
         if root1 == root2:
             return False
 
-        if self.rank[root1] < self.rank[root2]:
-            root1, root2 = root2, root1  # Make root1 taller
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1  # Make root1 the larger set
         self.parent[root2] = root1
-
-        # If trees are equal rank (approximate height), increment rank by one
-        if self.rank[root1] == self.rank[root2]:
-            self.rank[root1] += 1
+        self.size[root1] += self.size[root2]
 
         return True
+
+
+class UnionFindArray:
+    """
+    Disjoint Set Union over the integer ids 0..n-1.
+
+    Same algorithm as UnionFind, but parent and size live in flat
+    int arrays instead of dicts, so no hashing is needed. Hot loops
+    can call uf_find / uf_union on the arrays directly.
+    """
+
+    def __init__(self, n: int) -> None:
+        """Initialize n singleton sets."""
+        self.parent: array[int] = array("i", range(n))
+        self.size: array[int] = array("i", [1]) * n
+
+    def find(self, x: int) -> int:
+        """Find the root representative of x's set."""
+        return uf_find(self.parent, x)
+
+    def union(self, x: int, y: int) -> bool:
+        """
+        Merge the sets containing x and y.
+
+        Returns True if x and y were in different sets,
+        False if already in the same set.
+        """
+        return uf_union(self.parent, self.size, x, y)
+
+
+def uf_find(parent: array[int], x: int) -> int:
+    """Find the root of x in a parent array, compressing the path."""
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:
+        parent[x], x = root, parent[x]
+    return root
+
+
+def uf_union(parent: array[int], size: array[int], x: int, y: int) -> bool:
+    """Merge the sets of x and y by size. Returns False if they were already merged."""
+    root1, root2 = uf_find(parent, x), uf_find(parent, y)
+    if root1 == root2:
+        return False
+    if size[root1] < size[root2]:
+        root1, root2 = root2, root1
+    parent[root2] = root1
+    size[root1] += size[root2]
+    return True
@@ -1,16 +1,23 @@
-from typing import TypeVar
+from typing import Protocol, TypeVar
 
 Node = TypeVar("Node")
 
 
+class ParentMap(Protocol[Node]):
+    """Anything mapping a node to its parent: a dict, or an array indexed by node id."""
+
+    def __getitem__(self, node: Node, /) -> Node: ...
+
+
 def reconstruct_path(
     source: Node,
     target: Node,
-    parent: dict[Node, Node],
+    parent: ParentMap[Node],
 ) -> list[Node]:
     curr = target
     path = [curr]
     while curr != source:
         curr = parent[curr]
         path.append(curr)
-    return path[::-1]
+    path.reverse()
+    return path
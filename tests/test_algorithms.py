@@ -1,4 +1,18 @@
-from goldengraphs import a_star, dijkstra, dijkstra_all_paths
+import itertools
+import random
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from goldengraphs import (
+    a_star,
+    a_star_bidir,
+    bidirectional_dijkstra,
+    dijkstra,
+    dijkstra_all_paths,
+    dijkstra_multi_source,
+)
+from goldengraphs.algorithms import DirectedGraph, Graph, UnionFind, kahn, kruskal
 
 
 def test_dijkstra() -> None:
@@ -11,3 +25,287 @@ def test_dijkstra_all_paths() -> None:
 
 def test_a_star() -> None:
     pass
+
+
+def test_to_csr() -> None:
+    graph: DirectedGraph[str] = DirectedGraph()
+    for src, dst, weight in [("a", "b", 1.0), ("a", "c", 4.0), ("b", "c", 2.0)]:
+        graph.add_edge(src, dst, weight)
+    csr = graph.to_csr()
+    assert list(csr.indptr) == [0, 2, 3, 3]
+    assert sorted(csr.get_adjs(csr.ids["a"])) == [(csr.ids["b"], 1.0), (csr.ids["c"], 4.0)]
+    assert graph.to_csr() is csr
+    graph.add_edge("c", "a", 1.0)
+    assert graph.to_csr() is not csr
+
+    ids = graph.to_csr().ids
+    path, dist = dijkstra(ids["a"], lambda node, _: node == ids["c"], graph.to_csr())
+    assert path == [ids["a"], ids["b"], ids["c"]]
+    assert dist == 3.0
+
+
+def test_dijkstra_all_paths_csr() -> None:
+    graph: DirectedGraph[str] = DirectedGraph(nodes={"e"})
+    for src, dst, weight in [("a", "b", 1.0), ("a", "c", 4.0), ("b", "c", 2.0), ("c", "d", 1.0)]:
+        graph.add_edge(src, dst, weight)
+    csr = graph.to_csr()
+    source = csr.ids["a"]
+    assert dijkstra_all_paths(source, csr) == dijkstra_all_paths(source, csr.get_adjs)
+    dists, _ = dijkstra_all_paths(source, csr)
+    assert csr.ids["e"] not in dists
+    assert dists[csr.ids["d"]] == 4.0
+
+
+def test_a_star_csr() -> None:
+    graph: DirectedGraph[tuple[int, int]] = DirectedGraph()
+    for x in range(5):
+        for y in range(5):
+            for dx, dy in (1, 0), (0, 1):
+                if x + dx < 5 and y + dy < 5:
+                    graph.add_edge((x, y), (x + dx, y + dy), 1.0)
+    csr = graph.to_csr()
+    nodes = list(csr.ids)
+    goal = csr.ids[4, 4]
+    path, dist = a_star(csr.ids[0, 0], lambda node, _: node == goal, csr, lambda node: 8 - sum(nodes[node]))
+    assert dist == 8.0
+    assert len(path) == 9
+    assert (path[0], path[-1]) == (csr.ids[0, 0], goal)
+
+
+def test_a_star_reopens() -> None:
+    # h is admissible but not consistent: b is first expanded via s -> b and later improved via a
+    graph: DirectedGraph[str] = DirectedGraph()
+    for src, dst, weight in ("s", "a", 1.0), ("s", "b", 4.0), ("a", "b", 1.0), ("b", "g", 5.0):
+        graph.add_edge(src, dst, weight)
+    h = {"s": 0.0, "a": 5.0, "b": 0.0, "g": 0.0}
+    assert a_star("s", lambda node, _: node == "g", graph.get_adjs, h.__getitem__) == (["s", "a", "b", "g"], 7.0)
+    csr = graph.to_csr()
+    names = list(csr.ids)
+    path, dist = a_star(csr.ids["s"], lambda node, _: names[node] == "g", csr, lambda node: h[names[node]])
+    assert ([names[node] for node in path], dist) == (["s", "a", "b", "g"], 7.0)
+
+
+def test_bidirectional_dijkstra() -> None:
+    rng = random.Random(0)
+    graph: DirectedGraph[int] = DirectedGraph(nodes=set(range(30)))
+    for _ in range(90):
+        graph.add_edge(rng.randrange(30), rng.randrange(30), rng.randint(1, 10))
+    for source, target in [(rng.randrange(30), rng.randrange(30)) for _ in range(20)]:
+        path, dist = bidirectional_dijkstra(source, target, graph.get_adjs, graph.get_radjs)
+        assert dist == dijkstra(source, lambda node, _, t=target: node == t, graph.get_adjs)[1]
+        if path:
+            assert (path[0], path[-1]) == (source, target)
+            assert sum(graph.adjs[u][v] for u, v in itertools.pairwise(path)) == dist
+
+
+def test_a_star_bidir() -> None:
+    rng = random.Random(1)
+    graph: DirectedGraph[tuple[int, int]] = DirectedGraph()
+    for x in range(8):
+        for y in range(8):
+            for dx, dy in (1, 0), (0, 1):
+                if x + dx < 8 and y + dy < 8:
+                    weight = rng.randint(1, 5)
+                    graph.add_edge((x, y), (x + dx, y + dy), weight)
+                    graph.add_edge((x + dx, y + dy), (x, y), weight)
+    source, target = (0, 0), (7, 5)
+
+    def manhattan(a: tuple[int, int], b: tuple[int, int]) -> float:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    expected = dijkstra(source, lambda node, _: node == target, graph.get_adjs)[1]
+    path, dist = a_star_bidir(
+        source,
+        target,
+        graph.get_adjs,
+        graph.get_adjs,
+        lambda node: manhattan(node, target),
+        lambda node: manhattan(source, node),
+    )
+    assert dist == expected
+    assert sum(graph.adjs[u][v] for u, v in itertools.pairwise(path)) == dist
+    assert a_star_bidir(source, target, graph.get_adjs, graph.get_adjs, lambda node: manhattan(node, target))[1] == dist
+
+
+def test_union_find() -> None:
+    uf: UnionFind[int] = UnionFind()
+    # Build a long chain directly so find has to walk it without recursing
+    uf.parent = {i: i + 1 for i in range(10_000)} | {10_000: 10_000}
+    uf.size = dict.fromkeys(range(10_001), 1)
+    assert uf.find(0) == 10_000
+    assert uf.parent[5_000] == 10_000
+    assert not uf.union(0, 10_000)
+    assert uf.union(0, -1)
+    assert uf.find(-1) == 10_000
+
+
+def test_kruskal() -> None:
+    rng = random.Random(2)
+    graph: Graph[int] = Graph(nodes=set(range(20)))
+    for node in range(1, 20):
+        graph.add_edge(node, rng.randrange(node), rng.randint(1, 10))
+    for _ in range(40):
+        graph.add_edge(rng.randrange(20), rng.randrange(20), rng.randint(1, 10))
+    mst = kruskal(graph)
+    assert mst.num_edges() == 19
+
+    uf: UnionFind[int] = UnionFind()
+    expected = 0
+    for src, dst, weight in sorted(graph.get_edges(), key=lambda e: e[2]):
+        if uf.union(src, dst):
+            expected += weight
+    assert sum(weight for _, _, weight in mst.get_edges()) == expected
+
+
+def test_kahn() -> None:
+    rng = random.Random(3)
+    graph: DirectedGraph[int] = DirectedGraph(nodes=set(range(30)))
+    for _ in range(60):
+        src, dst = sorted(rng.sample(range(30), 2))
+        graph.add_edge(src, dst, 1.0)
+    for order in kahn(graph), kahn(set(graph.get_nodes()), lambda node: graph.adjs[node]):
+        assert sorted(order) == list(range(30))
+        position = {node: i for i, node in enumerate(order)}
+        assert all(position[src] < position[dst] for src, dst, _ in graph.get_edges())
+
+    graph.add_edge(29, 0, 1.0)
+    assert len(kahn(graph)) < 30
+
+
+def test_kahn_on_step_order() -> None:
+    graph: DirectedGraph[str] = DirectedGraph()
+    for i in range(10):
+        graph.add_edge(f"n{i}", "z", 1.0)
+    steps: list[str] = []
+
+    def on_step(node: str, _order: Sequence[str], _in_degree: Mapping[str, int], _q: Sequence[str]) -> None:
+        steps.append(node)
+
+    assert kahn(graph) == kahn(graph, on_step=on_step) == steps
+    assert steps == [*(f"n{i}" for i in range(10)), "z"]
+
+
+def test_dijkstra_multi_source() -> None:
+    rng = random.Random(4)
+    graph: DirectedGraph[int] = DirectedGraph(nodes=set(range(25)))
+    for _ in range(80):
+        graph.add_edge(rng.randrange(25), rng.randrange(25), rng.randint(1, 10))
+    _, indptr, indices, weights = graph.to_csr()
+    sources = [0, 7, 13]
+    for max_workers in 1, 3:
+        dists, _ = dijkstra_multi_source(sources, indptr, indices, weights, max_workers)
+        for source, row in zip(sources, dists, strict=True):
+            expected, _ = dijkstra_all_paths(source, graph.to_csr().get_adjs)
+            assert {node: dist for node, dist in enumerate(row) if dist != float("inf")} == expected
+
+
+def test_dijkstra_on_step_queue_view() -> None:
+    graph: DirectedGraph[str] = DirectedGraph()
+    for src, dst, weight in [("a", "b", 1.0), ("a", "c", 4.0), ("b", "c", 2.0)]:
+        graph.add_edge(src, dst, weight)
+    queues: list[list[tuple[float, str]]] = []
+
+    def on_step(
+        _node: str,
+        _visited: set[str],
+        _dists: dict[str, float],
+        _parent: dict[str, str],
+        queue: Sequence[tuple[float, str]],
+    ) -> None:
+        queues.append(list(queue))
+
+    dijkstra_all_paths("a", graph.get_adjs, on_step)
+    assert queues == [[], [(4.0, "c")], [(4.0, "c")]]
+
+
+def test_kahn_on_step() -> None:
+    edges = {"a": ["b", "c"], "b": ["c"], "c": []}
+    steps: list[tuple[str, list[str], dict[str, int], list[str]]] = []
+    kahn(
+        set(edges),
+        edges.__getitem__,
+        lambda node, order, in_degree, q: steps.append((node, list(order), dict(in_degree), list(q))),
+    )
+    assert steps == [
+        ("a", ["a"], {"a": 0, "b": 1, "c": 2}, []),
+        ("b", ["a", "b"], {"a": 0, "b": 0, "c": 1}, []),
+        ("c", ["a", "b", "c"], {"a": 0, "b": 0, "c": 0}, []),
+    ]
+
+
+def test_kahn_on_step_in_degree_is_read_only() -> None:
+    edges = {"a": ["b"], "b": []}
+    views: list[Mapping[str, int]] = []
+
+    def on_step(_node: str, _order: Sequence[str], in_degree: Mapping[str, int], _q: Sequence[str]) -> None:
+        with pytest.raises(KeyError):
+            in_degree["missing"]
+        views.append(in_degree)
+
+    kahn(set(edges), edges.__getitem__, on_step)
+    assert dict(views[-1]) == {"a": 0, "b": 0}
+
+
+def test_graph_edges_are_symmetric() -> None:
+    graph: Graph[str] = Graph()
+    graph.add_edge("a", "b", 2.0)
+    graph.add_edge("b", "b", 1.0)
+    assert graph.get_weight("b", "a") == 2.0
+    assert graph.remove_edge("b", "a")
+    assert not graph.has_edge("a", "b")
+    assert not graph.remove_edge("a", "b")
+    assert graph.remove_edge("b", "b")
+
+
+def test_reverse_adjacency() -> None:
+    graph: DirectedGraph[str] = DirectedGraph()
+    for src, dst in [("a", "c"), ("b", "c"), ("c", "c"), ("c", "d")]:
+        graph.add_edge(src, dst, 1.0)
+    assert graph.in_degree("c") == 3
+    assert sorted(graph.get_radjs("c")) == [("a", 1.0), ("b", 1.0), ("c", 1.0)]
+    graph.remove_edge("a", "c")
+    assert graph.in_degree("c") == 2
+    graph.remove_node("c")
+    assert list(graph.get_edges()) == []
+    assert graph.in_degree("d") == 0
+
+
+def test_dijkstra_compacts_queue() -> None:
+    # Settling node i improves the tentative distance of every j > i, so the lazy heap gains O(n^2) entries
+    n = 50
+    graph: DirectedGraph[int] = DirectedGraph()
+    for i in range(n):
+        for j in range(i + 1, n):
+            graph.add_edge(i, j, 2 * (j - i) - 1)
+    sizes: list[int] = []
+
+    def on_step(
+        _node: int,
+        _visited: set[int],
+        _dists: dict[int, float],
+        _parent: dict[int, int],
+        queue: Sequence[tuple[float, int]],
+    ) -> None:
+        sizes.append(len(queue))
+
+    dists, _ = dijkstra_all_paths(0, graph.get_adjs, on_step)
+    assert max(sizes) <= 2 * n
+    assert dists == {node: node for node in range(n)}
+
+
+def test_a_star_cache_h() -> None:
+    graph: Graph[int] = Graph()
+    for node in range(10):
+        graph.add_edge(node, node + 1, 1.0)
+        graph.add_edge(node, node + 2, 3.0)
+    calls: list[int] = []
+
+    def h(node: int) -> float:
+        calls.append(node)
+        return 10 - node
+
+    for cache_h in False, True:
+        calls.clear()
+        _, dist = a_star(0, lambda node, _: node == 10, graph.get_adjs, h, cache_h=cache_h)
+        assert dist == 10.0
+    assert sorted(calls) == sorted(set(calls))